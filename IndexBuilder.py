@@ -1,3 +1,5 @@
+import os
+
 from sqlalchemy import create_engine, exc, text
 from sqlalchemy.orm import sessionmaker
 
@@ -5,62 +7,48 @@ class IndexRebuilder:
     def __init__(self, server, database, username, password):
         # Connection string for SQL Server
         self.connection_string = f"mssql+pyodbc://{username}:{password}@{server}/{database}?driver=ODBC+Driver+17+for+SQL+Server"
-        
-    def verify_all_results_exist(self, session, given_id):
+
+        # Create the engine and session factory once so connections are pooled across runs
+        self.engine = create_engine(
+            self.connection_string,
+            echo=os.environ.get("SQL_ECHO", "").lower() in ("1", "true", "yes"),
+            pool_pre_ping=True,
+            pool_size=5,
+        )
+        self.Session = sessionmaker(bind=self.engine)
+
+    def verify_and_build(self, session, given_id):
         try:
-            # Read and check records from the RunData table
-            query = text("SELECT * FROM RunData WHERE id = :given_id AND value BETWEEN 10 AND 20")
-            result = session.execute(query, {"given_id": given_id})
-            records = result.fetchall()
+            # Check RunData and call the stored procedure server-side (see VerifyAndBuild.sql);
+            # it returns 1 if the Index Builder ran and 0 if no records were found
+            batch = text("EXEC dbo.VerifyAndBuild :given_id")
+            built = session.execute(batch, {"given_id": given_id}).scalar()
 
-            if not records:
+            # Commit the changes
+            session.commit()
+
+            if not built:
                 print(f"No records found in RunData for id {given_id} within the specified range.")
                 return False
             else:
-                print(f"Records found in RunData for id {given_id} within the specified range:")
-                for record in records:
-                    print(record)
+                print(f"Records found in RunData for id {given_id} within the specified range; Index Builder executed.")
                 return True
 
         except exc.SQLAlchemyError as e:
             # Capture any exception
-            print(f"An error occurred during verification: {e}")
+            print(f"An error occurred during verification or Index Builder execution: {e}")
             return False
 
-    def execute_index_builder(self, session):
-        try:
-            # Call stored procedure
-            session.execute(text("EXEC dbo.YourStoredProcedure"))
-
-            # Commit the changes
-            session.commit()
-
-        except exc.SQLAlchemyError as e:
-            # Capture any exception
-            print(f"An error occurred during Index Builder execution: {e}")
-
     def run(self, given_id):
         try:
-            # Creating the engine and session
-            engine = create_engine(self.connection_string, echo=True)
-            Session = sessionmaker(bind=engine)
-            session = Session()
-
-            # Step 1: Verify all results exist in the RunData table
-            results_exist = self.verify_all_results_exist(session, given_id)
-
-            # Step 2: Execute the Index Builder if results exist
-            if results_exist:
-                self.execute_index_builder(session)
+            with self.Session() as session:
+                # Execute the Index Builder only if results exist in the RunData table
+                self.verify_and_build(session, given_id)
 
         except exc.SQLAlchemyError as e:
             # Capture any exception
             print(f"An error occurred: {e}")
 
-        finally:
-            # Close the session
-            session.close()
-
 # Example usage
 if __name__ == "__main__":
     # Replace the following with your SQL Server credentials
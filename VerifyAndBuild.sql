@@ -0,0 +1,27 @@
+-- Runs the Index Builder only if RunData has results for the given id.
+-- Called from IndexRebuilder.verify_and_build as: EXEC dbo.VerifyAndBuild :given_id
+--
+-- Returns a single row: 1 if the Index Builder ran, 0 if no records were found.
+-- The caller reads the first result set, so dbo.YourStoredProcedure must not
+-- return result sets of its own. A failed build is re-thrown and never reports 1.
+CREATE OR ALTER PROCEDURE dbo.VerifyAndBuild
+    @id INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    IF EXISTS (SELECT 1 FROM RunData WHERE id = @id AND value BETWEEN 10 AND 20)
+    BEGIN
+        BEGIN TRY
+            EXEC dbo.YourStoredProcedure;
+        END TRY
+        BEGIN CATCH
+            THROW;
+        END CATCH;
+
+        SELECT 1;
+    END
+    ELSE
+        SELECT 0;
+END
+GO